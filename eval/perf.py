@@ -12,29 +12,90 @@ Chart:
 - y-axis: blocks mined (log scale)
 - annotation: small-font blocks mined over each bar
 
-This script uses `./bin/client blockchain -miner <ip>:8001` and reads `chain_length`.
+This script queries each miner's `RPCService.GetStatus` over a persistent JSON-RPC
+connection on <ip>:8001 and reads `ChainLength` (`--use-client-bin` switches back to
+spawning `./bin/client blockchain -miner <ip>:8001` per query). All deployed miners
+are queried concurrently and the largest `chain_length` is used.
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import csv
+import functools
+import ipaddress
 import json
+import mmap
+import os
+import queue
+import random
+import re
+import shlex
+import signal
+import socket
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used instead
+    orjson = None
+
+
+if orjson is not None:
+
+    def _loads(data: Any) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any, *, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+else:
+
+    def _loads(data: Any) -> Any:
+        return json.loads(data)
+
+    def _dumps(obj: Any, *, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_COUNTS = [1, 3, 5, 7]
 DEFAULT_DIFFICULTIES = [3, 4, 5]
 DEFAULT_MINER_PORT = 8001
+DEFAULT_CACHE_TTL_SEC = 0.5
+DEFAULT_REMOTE_DIR = "/osds_project2"
+PROGRESS_MODES = ("events", "poll")
+# How recent the progress loop's last observation must be to stand in for end_len.
+END_OBSERVATION_MAX_AGE_SEC = 2.0
+
+# Same non-interactive options `make deploy_miner` uses.
+SSH_OPTS = [
+    "-o", "StrictHostKeyChecking=no",
+    "-o", "UserKnownHostsFile=/dev/null",
+    "-o", "BatchMode=yes",
+    "-o", "ConnectTimeout=5",
+]
+
+# Miner log lines that mean the local chain grew (see pkg/network/network.go).
+# Block indices start at 0 (genesis), so block #N implies chain_length N+1.
+_BLOCK_EVENT_RE = re.compile(r"(?:Mined|Accepted) block #(\d+)|new length: (\d+)")
+
+CLIENT_BIN = REPO_ROOT / "bin" / "client"
+
+# addr -> (monotonic time of observation, chain_length). Successive queries to the same
+# miner within the TTL reuse the last answer instead of spawning another client process.
+_CHAIN_CACHE: Dict[str, Tuple[float, int]] = {}
+_chain_cache_ttl_sec = DEFAULT_CACHE_TTL_SEC
+_use_client_bin = False
 
 
 @dataclass(frozen=True)
@@ -51,93 +112,601 @@ class RunResult:
     ended_at: str
 
 
+def _utc_now_iso() -> str:
+    # Same "...Z" format as before, but from an aware datetime (utcnow() is deprecated).
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
 def run_cmd(
     args: List[str],
     *,
-    cwd: Path,
     timeout_sec: float,
 ) -> subprocess.CompletedProcess:
-    return subprocess.run(
+    # No cwd= here: main() chdirs to REPO_ROOT once, so relative paths like ./bin/client
+    # resolve without passing it to every spawn. Like every child here it gets its own
+    # session so a terminal Ctrl-C only reaches main()'s handler.
+    with subprocess.Popen(
         args,
-        cwd=str(cwd),
-        timeout=max(1, int(timeout_sec)),
-        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-        capture_output=True,
-    )
+        start_new_session=True,
+    ) as proc:
+        try:
+            out, err = proc.communicate(timeout=max(1, int(timeout_sec)))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, args, out, err)
+    return subprocess.CompletedProcess(args, proc.returncode, out, err)
+
+
+# Process groups of running `make` invocations, killed by kill_child_commands().
+_CHILD_PGIDS: "set[int]" = set()
+
+
+def kill_child_commands() -> None:
+    """SIGTERM every command started by stream_cmd that is still running."""
+    for pgid in list(_CHILD_PGIDS):
+        try:
+            os.killpg(pgid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
+def stream_cmd(args: List[str], *, label: str, check: bool) -> int:
+    """Run a command, echoing its combined output line by line with elapsed-time stamps.
+
+    The command runs in its own session, so a terminal Ctrl-C doesn't kill it (and e.g.
+    leave a deploy half done); use kill_child_commands() to stop it explicitly.
+    """
+    t0 = time.monotonic()
+    with subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        start_new_session=True,
+    ) as proc:
+        _CHILD_PGIDS.add(proc.pid)
+        try:
+            assert proc.stdout is not None
+            for line in proc.stdout:
+                print(f"[{label} {time.monotonic() - t0:.1f}s] {line}", end="", flush=True)
+        finally:
+            _CHILD_PGIDS.discard(proc.pid)
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, args)
+    return proc.returncode
+
+
+# First token of every line that is neither blank nor a comment.
+_MINER_IP_RE = re.compile(rb"(?m)^[ \t]*([^\s#]\S*)")
 
 
 def read_miner_ips(path: Path) -> List[str]:
     if not path.exists():
         raise FileNotFoundError(f"Missing {path}. This script expects miner IPs in minerip.txt.")
+    if path.stat().st_size == 0:
+        # mmap cannot map an empty file.
+        return []
 
-    ips: List[str] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        ip = line.strip()
-        if not ip or ip.startswith("#"):
-            continue
-        ips.append(ip)
-    return ips
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [m.decode("utf-8") for m in _MINER_IP_RE.findall(mm)]
 
 
-def client_chain_length(miner_addr: str, *, timeout_sec: float) -> Optional[int]:
-    client_bin = REPO_ROOT / "bin" / "client"
-    if not client_bin.exists():
+@functools.lru_cache(maxsize=None)
+def _check_miner_ip(ip: str) -> str:
+    # Validated when an IP is first deployed to rather than while parsing minerip.txt.
+    try:
+        ipaddress.ip_address(ip)
+    except ValueError:
+        raise ValueError(f"Invalid miner IP in minerip.txt: {ip!r}") from None
+    return ip
+
+
+@functools.lru_cache(maxsize=None)
+def _require_client_bin() -> str:
+    # Checked lazily (once) rather than at import: `make deploy_miner` builds the client,
+    # so it may not exist yet when this module is loaded.
+    if not CLIENT_BIN.exists():
         raise FileNotFoundError(
-            f"Missing {client_bin}. Run `make compile` (or let `make deploy_miner` build it) first."
+            f"Missing {CLIENT_BIN}. Run `make compile` (or let `make deploy_miner` build it) first."
         )
+    return str(CLIENT_BIN)
+
+
+def _cached_chain_length(miner_addr: str) -> Optional[int]:
+    t, v = _CHAIN_CACHE.get(miner_addr, (0.0, 0))
+    if time.monotonic() - t < _chain_cache_ttl_sec:
+        return v
+    return None
+
+
+def _store_chain_length(miner_addr: str, value: int) -> int:
+    _CHAIN_CACHE[miner_addr] = (time.monotonic(), value)
+    return value
+
+
+class _MinerRPC:
+    """Persistent JSON-RPC connection to one miner.
+
+    Miners accept the net/rpc/jsonrpc codec on their regular RPC port (see
+    Miner.serveConn), so one TCP connection is reused for every query instead of
+    spawning ./bin/client each time.
+    """
+
+    def __init__(self, addr: str) -> None:
+        self.addr = addr
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._rfile = None
+        self._next_id = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._rfile = None
+
+    def call(self, method: str, params: Any, *, timeout_sec: float) -> Any:
+        with self._lock:
+            try:
+                if self._sock is None:
+                    host, port = self.addr.rsplit(":", 1)
+                    self._sock = socket.create_connection((host, int(port)), timeout=timeout_sec)
+                    self._rfile = self._sock.makefile("rb")
+                self._sock.settimeout(timeout_sec)
+                self._next_id += 1
+                req = {"method": method, "params": [params], "id": self._next_id}
+                self._sock.sendall(_dumps(req) + b"\n")
+                line = self._rfile.readline()
+                if not line:
+                    raise ConnectionError(f"{self.addr} closed the connection")
+                resp = _loads(line)
+            except BaseException:
+                # Any failure may leave a half-read reply on the stream; start over next time.
+                self._close()
+                raise
+            if resp.get("id") != self._next_id:
+                self._close()
+                raise ConnectionError(f"{self.addr} replied out of order")
+            if resp.get("error"):
+                raise RuntimeError(f"{method} on {self.addr}: {resp['error']}")
+            return resp["result"]
+
+
+_RPC_CONNS: Dict[str, _MinerRPC] = {}
+# Shared by every observation tick so queries to distinct miners run side by side, each
+# on that miner's persistent connection. Threads are only started on first use.
+_RPC_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="miner-rpc")
+
+
+def _rpc_conn(miner_addr: str) -> _MinerRPC:
+    conn = _RPC_CONNS.get(miner_addr)
+    if conn is None:
+        conn = _RPC_CONNS.setdefault(miner_addr, _MinerRPC(miner_addr))
+    return conn
+
+
+def _close_rpc(miner_addr: str) -> None:
+    conn = _RPC_CONNS.pop(miner_addr, None)
+    if conn is not None:
+        conn.close()
+
+
+def client_chain_length(miner_addr: str, *, timeout_sec: float) -> Optional[int]:
+    cached = _cached_chain_length(miner_addr)
+    if cached is not None:
+        return cached
+    if _use_client_bin:
+        return _client_bin_chain_length(miner_addr, timeout_sec=timeout_sec)
+
+    try:
+        status = _rpc_conn(miner_addr).call("RPCService.GetStatus", {}, timeout_sec=timeout_sec)
+        return _store_chain_length(miner_addr, int(status["ChainLength"]))
+    except Exception:
+        return None
+
+
+def _client_bin_chain_length(miner_addr: str, *, timeout_sec: float) -> Optional[int]:
+    client_bin = _require_client_bin()
 
     try:
         cp = run_cmd(
-            [str(client_bin), "blockchain", "-miner", miner_addr],
-            cwd=REPO_ROOT,
+            [client_bin, "blockchain", "-miner", miner_addr],
             timeout_sec=timeout_sec,
         )
-        data = json.loads(cp.stdout)
+        data = _loads(cp.stdout)
         if "chain_length" not in data:
             return None
-        return int(data["chain_length"])
+        return _store_chain_length(miner_addr, int(data["chain_length"]))
     except Exception:
         return None
 
 
-def wait_for_chain_length(
-    miner_ip: str,
+async def _client_chain_length_async(miner_addr: str, timeout_sec: float) -> Optional[int]:
+    cached = _cached_chain_length(miner_addr)
+    if cached is not None:
+        return cached
+    if not _use_client_bin:
+        return await asyncio.get_running_loop().run_in_executor(
+            _RPC_POOL, functools.partial(client_chain_length, miner_addr, timeout_sec=timeout_sec)
+        )
+    client_bin = _require_client_bin()
+
+    proc = await asyncio.create_subprocess_exec(
+        client_bin,
+        "blockchain",
+        "-miner",
+        miner_addr,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout_sec)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+
+    if proc.returncode != 0:
+        return None
+    try:
+        data = _loads(out)
+        if "chain_length" not in data:
+            return None
+        return _store_chain_length(miner_addr, int(data["chain_length"]))
+    except Exception:
+        return None
+
+
+async def _observe_chain_length(addrs: List[str], *, timeout_sec: float) -> Optional[int]:
+    """Query all miners concurrently and return the largest chain_length (None if none replied)."""
+    # One request per distinct miner, even if an address is listed more than once.
+    results = await asyncio.gather(
+        *[_client_chain_length_async(addr, timeout_sec) for addr in dict.fromkeys(addrs)],
+        return_exceptions=True,
+    )
+    # FileNotFoundError (missing client binary) is not transient, so surface it.
+    for r in results:
+        if isinstance(r, FileNotFoundError):
+            raise r
+    lengths = [r for r in results if isinstance(r, int)]
+    return max(lengths) if lengths else None
+
+
+async def _wait_for_chain_length(
+    miner_ips: List[str],
     *,
     port: int,
     timeout_sec: float,
     poll_interval_sec: float,
 ) -> int:
-    """Wait until a single miner responds to `client blockchain` and return its chain_length."""
-    deadline = time.time() + timeout_sec
-    addr = f"{miner_ip}:{port}"
-    while time.time() < deadline:
-        remaining = deadline - time.time()
+    addrs = [f"{ip}:{port}" for ip in miner_ips]
+    deadline = time.monotonic() + timeout_sec
+    attempt = 0
+    while time.monotonic() < deadline:
+        remaining = deadline - time.monotonic()
         per_call_timeout = max(0.5, min(2.0, remaining))
-        cur = client_chain_length(addr, timeout_sec=per_call_timeout)
+        cur = await _observe_chain_length(addrs, timeout_sec=per_call_timeout)
         if cur is not None:
             return cur
-        time.sleep(poll_interval_sec)
-    raise TimeoutError(f"Timed out waiting for miner RPC at {addr}")
+        # Back off from 50ms up to poll_interval_sec, jittered so miners aren't probed in lockstep.
+        delay = min(poll_interval_sec, 0.05 * (1.5**attempt)) * (1 + random.uniform(-0.1, 0.1))
+        attempt += 1
+        await asyncio.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+    raise TimeoutError(f"Timed out waiting for miner RPC at {', '.join(addrs)}")
 
 
-def pick_observer_ip(ips: List[str]) -> str:
-    if not ips:
-        raise ValueError("No miner IPs provided")
-    # Use the first miner in the deployed prefix as the single observation point.
-    return ips[0]
+def wait_for_chain_length(
+    miner_ips: List[str],
+    *,
+    port: int,
+    timeout_sec: float,
+    poll_interval_sec: float,
+) -> int:
+    """Wait until any miner answers a chain-length query and return the max chain_length.
+
+    Retries with exponential backoff (capped at `poll_interval_sec`) until `timeout_sec` elapses.
+    """
+    return asyncio.run(
+        _wait_for_chain_length(
+            miner_ips,
+            port=port,
+            timeout_sec=timeout_sec,
+            poll_interval_sec=poll_interval_sec,
+        )
+    )
 
 
-def make_deploy_miner(*, count: int, difficulty: int) -> None:
-    subprocess.run(
-        ["make", "deploy_miner", f"COUNT={count}", f"DIFFICULTY={difficulty}"],
-        cwd=str(REPO_ROOT),
-        check=True,
-    )
+async def _wait_unless_stopped(stop_event: threading.Event, timeout_sec: float) -> bool:
+    """Sleep up to `timeout_sec`, returning early (True) if `stop_event` is set."""
+    # The wait happens on a worker thread so the event loop keeps running meanwhile.
+    return await asyncio.to_thread(stop_event.wait, max(0.0, timeout_sec))
+
+
+def _progress_printer() -> Callable[[str], None]:
+    """Return a function that overwrites a single console line on each call."""
+    if sys.stdout.isatty():
+
+        def erase_and_print(msg: str) -> None:
+            # "\x1b[2K" erases the whole line, so no padding over the previous message is needed.
+            sys.stdout.write("\r\x1b[2K" + msg)
+            sys.stdout.flush()
+
+        return erase_and_print
+
+    # Not a terminal (e.g. piped to a log): avoid escape codes and pad instead.
+    last_print_len = 0
+
+    def print_progress_line(msg: str) -> None:
+        nonlocal last_print_len
+        padded = msg
+        if last_print_len > len(msg):
+            padded = msg + (" " * (last_print_len - len(msg)))
+        last_print_len = len(padded)
+        sys.stdout.write("\r" + padded)
+        sys.stdout.flush()
+
+    return print_progress_line
+
+
+def _chain_length_from_log_line(line: str) -> Optional[int]:
+    m = _BLOCK_EVENT_RE.search(line)
+    if m is None:
+        return None
+    if m.group(1) is not None:
+        return int(m.group(1)) + 1
+    return int(m.group(2))
+
+
+async def _watch_blocks(ip: str, events: asyncio.Queue, *, remote_dir: str) -> None:
+    """Tail a miner's log over ssh and push chain_length on every new-block event.
+
+    Always pushes a final None so the consumer can tell when the watcher has died.
+    """
+    # tail -F retries a missing file forever, so check it up front: a wrong --remote-dir
+    # then ends the watcher right away and the caller falls back to polling.
+    # Killing the local ssh doesn't signal the remote side, so the remote shell kills
+    # tail itself once its stdin (our end of the ssh channel) reaches EOF.
+    log = shlex.quote(f"{remote_dir}/miner.log")
+    remote_cmd = f"[ -r {log} ] || exit 1; tail -n 0 -F {log} </dev/null & read _; kill $!"
+    proc = None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ssh",
+            *SSH_OPTS,
+            f"root@{ip}",
+            remote_cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        assert proc.stdout is not None
+        async for raw in proc.stdout:
+            cur = _chain_length_from_log_line(raw.decode("utf-8", errors="replace"))
+            if cur is not None:
+                events.put_nowait(cur)
+    except OSError:
+        pass
+    finally:
+        if proc is not None:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        events.put_nowait(None)
+
+
+async def _poll_progress(
+    addrs: List[str],
+    *,
+    t0: float,
+    deadline: float,
+    start_len: int,
+    last_seen: int,
+    last_seen_t: float,
+    progress_interval_sec: float,
+    stop_event: threading.Event,
+    print_progress_line: Callable[[str], None],
+) -> Tuple[int, float]:
+    while True:
+        now = time.monotonic()
+        remaining = deadline - now
+        if remaining <= 0:
+            break
+        if await _wait_unless_stopped(stop_event, min(progress_interval_sec, remaining)):
+            break
+        elapsed = int(time.monotonic() - t0)
+
+        cur = await _observe_chain_length(addrs, timeout_sec=2.0)
+        if cur is not None:
+            last_seen, last_seen_t = cur, time.monotonic()
+        print_progress_line(
+            f"  t={elapsed:>4}s chain_length={last_seen} (+{last_seen - start_len})"
+        )
+    return last_seen, last_seen_t
+
+
+async def _event_progress(
+    ips: List[str],
+    addrs: List[str],
+    *,
+    t0: float,
+    deadline: float,
+    start_len: int,
+    remote_dir: str,
+    progress_interval_sec: float,
+    stop_event: threading.Event,
+    print_progress_line: Callable[[str], None],
+) -> Tuple[int, float, bool]:
+    """Render progress on new-block events.
+
+    If no new block shows up for `progress_interval_sec`, `addrs` are polled once so a
+    silent log (e.g. a miner that never writes to it) can't freeze the line.
+
+    Returns (last_seen, last_seen_t, completed); completed is False if every watcher
+    died early.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    watchers = [asyncio.create_task(_watch_blocks(ip, events, remote_dir=remote_dir)) for ip in ips]
+    alive = len(watchers)
+    last_seen, last_seen_t = start_len, float("-inf")
+    # Bounded by the deadline so the helper thread never outlives the window.
+    stopped = asyncio.create_task(_wait_unless_stopped(stop_event, deadline - time.monotonic()))
+    next_tick = time.monotonic() + progress_interval_sec
+    try:
+        while alive > 0:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                return last_seen, last_seen_t, True
+            get = asyncio.create_task(events.get())
+            await asyncio.wait(
+                {get, stopped},
+                timeout=min(remaining, max(0.0, next_tick - now)),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not get.done():
+                get.cancel()
+                if stopped.done() or time.monotonic() >= deadline:
+                    # Deadline reached or stop requested.
+                    return last_seen, last_seen_t, True
+                # Quiet for a whole interval: fall back to one poll.
+                cur = await _observe_chain_length(addrs, timeout_sec=2.0)
+                if cur is not None and cur >= last_seen:
+                    last_seen, last_seen_t = cur, time.monotonic()
+            else:
+                cur = get.result()
+                if cur is None:
+                    alive -= 1
+                    continue
+                # Every miner reports the same block as it propagates; only render growth.
+                if cur < last_seen:
+                    continue
+                if cur == last_seen:
+                    last_seen_t = time.monotonic()
+                    continue
+                last_seen, last_seen_t = cur, time.monotonic()
+            next_tick = time.monotonic() + progress_interval_sec
+            elapsed = int(time.monotonic() - t0)
+            print_progress_line(
+                f"  t={elapsed:>4}s chain_length={last_seen} (+{last_seen - start_len})"
+            )
+        return last_seen, last_seen_t, False
+    finally:
+        stopped.cancel()
+        for w in watchers:
+            w.cancel()
+        await asyncio.gather(stopped, *watchers, return_exceptions=True)
 
 
-def make_stop_miner() -> None:
-    subprocess.run(["make", "stop_miner"], cwd=str(REPO_ROOT), check=False)
+async def _progress(
+    ips: List[str],
+    *,
+    port: int,
+    start_len: int,
+    duration_sec: int,
+    progress_interval_sec: float,
+    progress_mode: str,
+    remote_dir: str,
+    stop_event: threading.Event,
+) -> Tuple[int, float]:
+    """Report chain_length during the window (or until `stop_event` is set).
+
+    Returns the last observed chain_length and the monotonic time it was observed.
+
+    In "events" mode the miners' logs are tailed over ssh so the line updates as soon as a
+    block lands, with a poll after any `progress_interval_sec` without one. If every
+    watcher dies (ssh fails, or miner.log is missing under `remote_dir`), the rest of the
+    window is polled.
+    """
+    addrs = [f"{ip}:{port}" for ip in ips]
+    print_progress_line = _progress_printer()
+
+    t0 = time.monotonic()
+    deadline = t0 + duration_sec
+    # start_len predates the window, so it never counts as a fresh end observation.
+    last_seen, last_seen_t = start_len, float("-inf")
+    print_progress_line(f"  t=   0s chain_length={start_len} (+0)")
+
+    completed = False
+    if progress_mode == "events":
+        last_seen, last_seen_t, completed = await _event_progress(
+            ips,
+            addrs,
+            t0=t0,
+            deadline=deadline,
+            start_len=start_len,
+            remote_dir=remote_dir,
+            progress_interval_sec=progress_interval_sec,
+            stop_event=stop_event,
+            print_progress_line=print_progress_line,
+        )
+    if not completed:
+        last_seen, last_seen_t = await _poll_progress(
+            addrs,
+            t0=t0,
+            deadline=deadline,
+            start_len=start_len,
+            last_seen=last_seen,
+            last_seen_t=last_seen_t,
+            progress_interval_sec=progress_interval_sec,
+            stop_event=stop_event,
+            print_progress_line=print_progress_line,
+        )
+
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+    return last_seen, last_seen_t
+
+
+def make_compile() -> None:
+    stream_cmd(["make", "compile"], label="compile", check=True)
+
+
+def make_deploy_miner(*, count: int, difficulty: int, offset: int = 0, span: Optional[int] = None) -> None:
+    args = ["make", "deploy_miner", f"COUNT={count}", f"DIFFICULTY={difficulty}"]
+    if span is not None:
+        # Slot-scoped: only stop/replace this slice of minerip.txt, and keep wallets apart
+        # so concurrent deploys don't delete each other's files.
+        args += [f"OFFSET={offset}", f"SPAN={span}", f"WALLET_DIR=logs/wallets/slot_{offset}"]
+    label = "deploy" if span is None else f"deploy slot {offset // span}"
+    stream_cmd(args, label=label, check=True)
+
+
+def make_stop_miner(*, offset: int = 0, span: Optional[int] = None) -> None:
+    args = ["make", "stop_miner"]
+    if span is not None:
+        args += [f"OFFSET={offset}", f"SPAN={span}"]
+    label = "stop" if span is None else f"stop slot {offset // span}"
+    stream_cmd(args, label=label, check=False)
+
+
+class ExperimentAborted(Exception):
+    """Raised by run_experiment when `stop_event` cut the experiment short.
+
+    `result` holds what was measured up to that point (duration_sec is the actual window;
+    0 if the stop came before the window opened).
+    """
+
+    def __init__(self, result: RunResult) -> None:
+        super().__init__(f"COUNT={result.count} DIFFICULTY={result.difficulty} aborted after {result.duration_sec}s")
+        self.result = result
 
 
 def run_experiment(
@@ -151,84 +720,149 @@ def run_experiment(
     ready_timeout_sec: float,
     poll_interval_sec: float,
     progress_interval_sec: float,
+    progress_mode: str = "events",
+    remote_dir: str = DEFAULT_REMOTE_DIR,
+    offset: int = 0,
+    span: Optional[int] = None,
+    stop_event: Optional[threading.Event] = None,
 ) -> RunResult:
-    if count > len(all_ips):
-        raise ValueError(f"Requested COUNT={count} but only {len(all_ips)} IPs are in minerip.txt")
+    """Deploy `count` miners starting at `offset` in minerip.txt and measure one window.
+
+    `span` (the slot size) scopes the Makefile's stop/deploy to `all_ips[offset:offset+span]`
+    so that several experiments can run side by side on disjoint slices. Setting
+    `stop_event` ends the window early; the partial result is raised as ExperimentAborted.
+    """
+    if offset + count > len(all_ips):
+        raise ValueError(
+            f"Requested COUNT={count} at offset {offset} but only {len(all_ips)} IPs are in minerip.txt"
+        )
 
-    ips = all_ips[:count]
-    observer_ip = pick_observer_ip(ips)
-    started_at = datetime.utcnow().isoformat() + "Z"
+    ips = [_check_miner_ip(ip) for ip in all_ips[offset : offset + count]]
+    if not ips:
+        raise ValueError("No miner IPs provided")
+
+    return asyncio.run(
+        _run_experiment(
+            ips=ips,
+            count=count,
+            difficulty=difficulty,
+            duration_sec=duration_sec,
+            port=port,
+            warmup_sec=warmup_sec,
+            ready_timeout_sec=ready_timeout_sec,
+            poll_interval_sec=poll_interval_sec,
+            progress_interval_sec=progress_interval_sec,
+            progress_mode=progress_mode,
+            remote_dir=remote_dir,
+            offset=offset,
+            span=span,
+            stop_event=stop_event if stop_event is not None else threading.Event(),
+        )
+    )
 
-    deploy_t0 = time.time()
-    make_deploy_miner(count=count, difficulty=difficulty)
-    deploy_elapsed = time.time() - deploy_t0
+
+async def _run_experiment(
+    *,
+    ips: List[str],
+    count: int,
+    difficulty: int,
+    duration_sec: int,
+    port: int,
+    warmup_sec: float,
+    ready_timeout_sec: float,
+    poll_interval_sec: float,
+    progress_interval_sec: float,
+    progress_mode: str,
+    remote_dir: str,
+    offset: int,
+    span: Optional[int],
+    stop_event: threading.Event,
+) -> RunResult:
+    started_at = _utc_now_iso()
+
+    deploy_t0 = time.monotonic()
+    try:
+        await asyncio.to_thread(make_deploy_miner, count=count, difficulty=difficulty, offset=offset, span=span)
+    except subprocess.CalledProcessError:
+        # A deploy killed because of the stop request is an abort, not a failure.
+        if not stop_event.is_set():
+            raise
+    deploy_elapsed = time.monotonic() - deploy_t0
+    if stop_event.is_set():
+        # Stopped before the window opened: nothing was measured (duration_sec=0).
+        raise ExperimentAborted(
+            RunResult(
+                count=count,
+                difficulty=difficulty,
+                duration_sec=0,
+                ips=ips,
+                start_chain_length=0,
+                end_chain_length=0,
+                blocks_mined=0,
+                deploy_elapsed_sec=deploy_elapsed,
+                started_at=started_at,
+                ended_at=_utc_now_iso(),
+            )
+        )
+    # Observations and connections from the previous deployment describe a different chain.
+    for ip in ips:
+        _CHAIN_CACHE.pop(f"{ip}:{port}", None)
+        _close_rpc(f"{ip}:{port}")
 
     if warmup_sec > 0:
-        time.sleep(warmup_sec)
+        await _wait_unless_stopped(stop_event, warmup_sec)
 
-    # Measure against a single miner via the client.
+    # Measure against every deployed miner via the client and take the longest chain.
     # Note: For large COUNT, miners begin mining as soon as they start; because deploy_miner
     # starts miners sequentially, some blocks may already exist by the time deployment finishes.
-    start_len = wait_for_chain_length(
-        observer_ip,
+    start_len = await _wait_for_chain_length(
+        ips,
         port=port,
         timeout_sec=ready_timeout_sec,
         poll_interval_sec=poll_interval_sec,
     )
 
+    # Setting stop_event (e.g. SIGINT in main) ends the window early; the end observation
+    # below is still taken so the partial result can be saved.
+    window_t0 = time.monotonic()
+    last_seen: Optional[int] = None
+    last_seen_t = 0.0
     # During the measurement window, optionally sample intermediate chain lengths.
     # We overwrite a single console line to avoid noisy output.
-    addr = f"{observer_ip}:{port}"
     if progress_interval_sec and progress_interval_sec > 0 and duration_sec > 0:
-        last_print_len = 0
-
-        def print_progress_line(msg: str) -> None:
-            nonlocal last_print_len
-            padded = msg
-            if last_print_len > len(msg):
-                padded = msg + (" " * (last_print_len - len(msg)))
-            last_print_len = len(padded)
-            sys.stdout.write("\r" + padded)
-            sys.stdout.flush()
-
-        t0 = time.time()
-        deadline = t0 + duration_sec
-        last_seen = start_len
-        print_progress_line(f"  t=   0s chain_length={start_len} (+0)")
-
-        while True:
-            now = time.time()
-            remaining = deadline - now
-            if remaining <= 0:
-                break
-            time.sleep(min(progress_interval_sec, remaining))
-            elapsed = int(time.time() - t0)
-
-            cur = client_chain_length(addr, timeout_sec=2.0)
-            if cur is not None:
-                last_seen = cur
-            print_progress_line(
-                f"  t={elapsed:>4}s chain_length={last_seen} (+{last_seen - start_len})"
-            )
-
-        sys.stdout.write("\n")
-        sys.stdout.flush()
+        last_seen, last_seen_t = await _progress(
+            ips,
+            port=port,
+            start_len=start_len,
+            duration_sec=duration_sec,
+            progress_interval_sec=progress_interval_sec,
+            progress_mode=progress_mode,
+            remote_dir=remote_dir,
+            stop_event=stop_event,
+        )
     else:
-        time.sleep(duration_sec)
-
-    end_len = wait_for_chain_length(
-        observer_ip,
-        port=port,
-        timeout_sec=ready_timeout_sec,
-        poll_interval_sec=poll_interval_sec,
-    )
+        await _wait_unless_stopped(stop_event, duration_sec)
+    window_elapsed = time.monotonic() - window_t0
+
+    # Reuse the progress loop's final observation as end_len when it is fresh enough,
+    # saving one more round of queries. This trades up to END_OBSERVATION_MAX_AGE_SEC of
+    # precision at the end of the window (blocks landing in that gap are not counted).
+    if last_seen is not None and time.monotonic() - last_seen_t < END_OBSERVATION_MAX_AGE_SEC:
+        end_len = last_seen
+    else:
+        end_len = await _wait_for_chain_length(
+            ips,
+            port=port,
+            timeout_sec=ready_timeout_sec,
+            poll_interval_sec=poll_interval_sec,
+        )
 
-    ended_at = datetime.utcnow().isoformat() + "Z"
+    ended_at = _utc_now_iso()
 
-    return RunResult(
+    res = RunResult(
         count=count,
         difficulty=difficulty,
-        duration_sec=duration_sec,
+        duration_sec=round(window_elapsed) if stop_event.is_set() else duration_sec,
         ips=ips,
         start_chain_length=start_len,
         end_chain_length=end_len,
@@ -237,39 +871,133 @@ def run_experiment(
         started_at=started_at,
         ended_at=ended_at,
     )
+    if stop_event.is_set():
+        raise ExperimentAborted(res)
+    return res
 
 
-def write_outputs(results: List[RunResult], out_dir: Path, *, ts: str) -> Tuple[Path, Path]:
-    out_dir.mkdir(parents=True, exist_ok=True)
-    json_path = out_dir / "results.json"
-    csv_path = out_dir / "results.csv"
+def describe_result(res: RunResult) -> str:
+    return (
+        f"blocks_mined={res.blocks_mined} (chain_length {res.start_chain_length} -> {res.end_chain_length}), "
+        f"deploy_elapsed={res.deploy_elapsed_sec:.1f}s"
+    )
+
 
-    json_path.write_text(
-        json.dumps([r.__dict__ for r in results], indent=2) + "\n",
-        encoding="utf-8",
+def run_parallel_sweep(
+    grid: List[Tuple[int, int]],
+    *,
+    all_ips: List[str],
+    slots: int,
+    slot_size: int,
+    stop_between: bool,
+    on_result: Optional[Callable[[RunResult], None]] = None,
+    stop_event: Optional[threading.Event] = None,
+    **experiment_kwargs,
+) -> List[RunResult]:
+    """Run (difficulty, count) experiments concurrently on disjoint slices of `all_ips`.
+
+    Slot k owns `all_ips[k*slot_size:(k+1)*slot_size]`; each worker borrows a free slot,
+    deploys into it and measures, so deploys of one slot overlap measurement windows of
+    the others. Results are returned in `grid` order; `on_result` is called (from the
+    worker thread) as each one completes. Once `stop_event` is set, running windows end
+    early (their partial results are kept) and queued experiments are skipped.
+    """
+    stop_event = stop_event if stop_event is not None else threading.Event()
+    free_offsets: "queue.Queue[int]" = queue.Queue()
+    for k in range(slots):
+        free_offsets.put(k * slot_size)
+
+    def task(diff: int, count: int) -> Optional[RunResult]:
+        offset = free_offsets.get()
+        try:
+            if stop_event.is_set():
+                return None
+            tag = f"[slot {offset // slot_size}]"
+            print(f"\n=== {tag} Running: COUNT={count}, DIFFICULTY={diff} ===")
+            try:
+                res = run_experiment(
+                    all_ips=all_ips,
+                    count=count,
+                    difficulty=diff,
+                    offset=offset,
+                    span=slot_size,
+                    stop_event=stop_event,
+                    **experiment_kwargs,
+                )
+            except ExperimentAborted as e:
+                res = e.result
+                if res.duration_sec <= 0:
+                    return None
+                print(f"{tag} Interrupted (COUNT={count}, DIFFICULTY={diff}): {describe_result(res)} over {res.duration_sec}s")
+            else:
+                print(f"{tag} Result (COUNT={count}, DIFFICULTY={diff}): {describe_result(res)}")
+            if on_result is not None:
+                on_result(res)
+            if stop_between:
+                make_stop_miner(offset=offset, span=slot_size)
+            return res
+        finally:
+            free_offsets.put(offset)
+
+    with ThreadPoolExecutor(max_workers=slots) as ex:
+        futures = [ex.submit(task, diff, count) for diff, count in grid]
+        try:
+            return [res for res in (f.result() for f in futures) if res is not None]
+        except BaseException:
+            # Cut the other slots' windows short instead of waiting them out on exit.
+            stop_event.set()
+            for f in futures:
+                f.cancel()
+            raise
+
+
+CSV_FIELDS = [
+    "count",
+    "difficulty",
+    "duration_sec",
+    "start_chain_length",
+    "end_chain_length",
+    "blocks_mined",
+    "deploy_elapsed_sec",
+    "ips",
+    "started_at",
+    "ended_at",
+]
+
+
+def _csv_row(res: RunResult) -> Tuple[Any, ...]:
+    """CSV row for `res`, in CSV_FIELDS order."""
+    return (
+        res.count,
+        res.difficulty,
+        res.duration_sec,
+        res.start_chain_length,
+        res.end_chain_length,
+        res.blocks_mined,
+        res.deploy_elapsed_sec,
+        ",".join(res.ips),
+        res.started_at,
+        res.ended_at,
     )
 
-    with csv_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(
-            f,
-            fieldnames=[
-                "count",
-                "difficulty",
-                "duration_sec",
-                "start_chain_length",
-                "end_chain_length",
-                "blocks_mined",
-                "deploy_elapsed_sec",
-                "ips",
-                "started_at",
-                "ended_at",
-            ],
-        )
-        w.writeheader()
-        for r in results:
-            row = r.__dict__.copy()
-            row["ips"] = ",".join(r.ips)
-            w.writerow(row)
+
+def append_result(res: RunResult, *, csv_writer, csv_f, ndjson_f) -> None:
+    """Persist one result immediately so an interrupted sweep keeps what it measured."""
+    csv_writer.writerow(_csv_row(res))
+    csv_f.flush()
+    ndjson_f.write(_dumps(asdict(res)) + b"\n")
+    ndjson_f.flush()
+
+
+def write_outputs(out_dir: Path) -> Tuple[Path, Path]:
+    """Finalize results.json from the streamed results.ndjson; returns (json, csv) paths."""
+    json_path = out_dir / "results.json"
+    csv_path = out_dir / "results.csv"
+    ndjson_path = out_dir / "results.ndjson"
+
+    with ndjson_path.open("rb") as f:
+        rows = [_loads(line) for line in f if line.strip()]
+    json_path.write_bytes(_dumps(rows, indent=True) + b"\n")
 
     return json_path, csv_path
 
@@ -282,43 +1010,44 @@ def plot_grouped_bars(
     counts: List[int],
     difficulties: List[int],
 ) -> None:
-    # Build lookup: (difficulty, count) -> blocks
-    lookup: Dict[Tuple[int, int], int] = {}
-    for r in results:
-        lookup[(r.difficulty, r.count)] = r.blocks_mined
+    # Imported here so matplotlib's backend/font-cache startup doesn't delay the sweep.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    matplotlib.rcParams["path.simplify"] = True
+    import matplotlib.pyplot as plt
+    import numpy as np
 
-    # Grouped bar positions
-    x_positions = list(range(len(difficulties)))
     n_groups = len(counts)
     if n_groups == 0:
         raise ValueError("No counts provided")
 
+    # Y[diff_idx, count_idx] = blocks mined (0 if that experiment is missing)
+    diff_idx = {d: i for i, d in enumerate(difficulties)}
+    count_idx = {c: j for j, c in enumerate(counts)}
+    Y = np.zeros((len(difficulties), n_groups), dtype=int)
+    for r in results:
+        if r.difficulty in diff_idx and r.count in count_idx:
+            Y[diff_idx[r.difficulty], count_idx[r.count]] = r.blocks_mined
+
+    # Grouped bar positions: offsets[:, i] are the bar centers for counts[i]
+    x_positions = np.arange(len(difficulties))
     total_width = 0.8
     bar_width = total_width / n_groups
+    offsets = x_positions[:, None] + (np.arange(n_groups) + 0.5) * bar_width - total_width / 2
 
     plt.figure(figsize=(9, 5.5))
 
     for i, count in enumerate(counts):
-        offsets = [x - total_width / 2 + (i + 0.5) * bar_width for x in x_positions]
-        ys: List[int] = []
-        for diff in difficulties:
-            ys.append(int(lookup.get((diff, count), 0)))
-
-        bars = plt.bar(offsets, ys, width=bar_width, label=f"miners={count}")
-
-        # Annotate values (small font) above each bar
-        for b, y in zip(bars, ys):
-            # Place at y, but keep it visible for y=0
-            y_text = y if y > 0 else 0.8
-            plt.text(
-                b.get_x() + b.get_width() / 2,
-                y_text,
-                str(y),
-                ha="center",
-                va="bottom",
-                fontsize=8,
-                rotation=0,
-            )
+        ys = Y[:, i]
+        bars = plt.bar(offsets[:, i], ys, width=bar_width, label=f"miners={count}")
+
+        # Annotate values (small font) above each bar. A zero-height bar has no top on
+        # the log scale, so its label is placed at y=0.8 to keep it visible.
+        plt.bar_label(bars, labels=[str(y) if y > 0 else "" for y in ys], fontsize=8)
+        for x, y in zip(offsets[:, i], ys):
+            if y <= 0:
+                plt.text(x, 0.8, str(y), ha="center", va="bottom", fontsize=8)
 
     plt.xlabel("difficulty")
     plt.ylabel("blocks mined (log scale)")
@@ -330,10 +1059,80 @@ def plot_grouped_bars(
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
+    plt.savefig(out_path, dpi=120, bbox_inches="tight")
     plt.close()
 
 
+def plot_from_csv(
+    csv_path: Path,
+    png_path: Path,
+    title: str,
+    counts: List[int],
+    diffs: List[int],
+) -> None:
+    """Render a grouped bar chart from a saved results.csv (e.g. to re-plot a past run)."""
+    with Path(csv_path).open(newline="", encoding="utf-8") as f:
+        results = [
+            RunResult(
+                count=int(row["count"]),
+                difficulty=int(row["difficulty"]),
+                duration_sec=int(row["duration_sec"]),
+                ips=row["ips"].split(",") if row["ips"] else [],
+                start_chain_length=int(row["start_chain_length"]),
+                end_chain_length=int(row["end_chain_length"]),
+                blocks_mined=int(row["blocks_mined"]),
+                deploy_elapsed_sec=float(row["deploy_elapsed_sec"]),
+                started_at=row["started_at"],
+                ended_at=row["ended_at"],
+            )
+            for row in csv.DictReader(f)
+        ]
+    plot_grouped_bars(
+        results,
+        out_path=Path(png_path),
+        title=title,
+        counts=counts,
+        difficulties=diffs,
+    )
+
+
+def plot_title(duration_sec: int) -> str:
+    return f"Blocks mined in {duration_sec}s (log scale)\n(grouped by miner_count)"
+
+
+def spawn_plot(run_dir: Path, *, duration_sec: int, counts: List[int], diffs: List[int]) -> None:
+    """Render run_dir/plot.png in a detached background process (`perf.py --plot-only`).
+
+    The intermediate `sh` backgrounds the plotter and exits right away, so the plotter is
+    reparented to init and main() neither waits on matplotlib nor leaves a child behind.
+    Its output (e.g. plotting errors) goes to run_dir/plot.log.
+    """
+    with (run_dir / "plot.log").open("wb") as log_f:
+        subprocess.run(
+            [
+                "sh",
+                "-c",
+                '"$@" &',
+                "sh",
+                sys.executable,
+                str(Path(__file__).resolve()),
+                "--plot-only",
+                str(run_dir),
+                "--duration",
+                str(duration_sec),
+                "--counts",
+                ",".join(str(c) for c in counts),
+                "--difficulties",
+                ",".join(str(d) for d in diffs),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=log_f,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+            check=True,
+        )
+
+
 def parse_csv_int_list(s: str) -> List[int]:
     return [int(x.strip()) for x in s.split(",") if x.strip()]
 
@@ -353,6 +1152,29 @@ def main() -> int:
         default=10.0,
         help="Seconds between intermediate client chain_length samples during the window (0 to disable)",
     )
+    p.add_argument(
+        "--progress-mode",
+        choices=PROGRESS_MODES,
+        default="events",
+        help="events: tail miner logs over ssh and update on each new block; poll: sample every --progress-interval",
+    )
+    p.add_argument(
+        "--remote-dir",
+        type=str,
+        default=DEFAULT_REMOTE_DIR,
+        help="Miner install dir on the remote hosts (REMOTE_DIR in the Makefile); miner.log is read from here",
+    )
+    p.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL_SEC,
+        help="Seconds to reuse a miner's last chain_length before querying it again (0 to disable)",
+    )
+    p.add_argument(
+        "--use-client-bin",
+        action="store_true",
+        help="Query miners by spawning ./bin/client per call instead of a persistent JSON-RPC connection",
+    )
     p.add_argument(
         "--out-dir",
         type=str,
@@ -364,9 +1186,43 @@ def main() -> int:
         action="store_true",
         help="Stop miners between each experiment (slower, cleaner)",
     )
+    p.add_argument(
+        "--parallel-slots",
+        type=int,
+        default=1,
+        help="Run experiments concurrently on this many disjoint slices of minerip.txt, "
+        "each max(counts) IPs long (default: 1, serial)",
+    )
+    p.add_argument(
+        "--plot-only",
+        type=str,
+        metavar="RUN_DIR",
+        help="Only (re)render RUN_DIR/plot.png from RUN_DIR/results.csv; no experiments are run",
+    )
 
     args = p.parse_args()
 
+    if args.plot_only:
+        run_dir = Path(args.plot_only).resolve()
+        png_path = run_dir / "plot.png"
+        plot_from_csv(
+            run_dir / "results.csv",
+            png_path,
+            plot_title(args.duration),
+            parse_csv_int_list(args.counts),
+            parse_csv_int_list(args.difficulties),
+        )
+        print(f"PNG:  {png_path}")
+        return 0
+
+    # All make/client invocations run relative to the repo root; chdir once instead of
+    # passing cwd= to every subprocess.
+    os.chdir(REPO_ROOT)
+
+    global _chain_cache_ttl_sec, _use_client_bin
+    _chain_cache_ttl_sec = max(0.0, args.cache_ttl)
+    _use_client_bin = args.use_client_bin
+
     counts = parse_csv_int_list(args.counts)
     diffs = parse_csv_int_list(args.difficulties)
 
@@ -376,53 +1232,111 @@ def main() -> int:
 
     all_ips = read_miner_ips(REPO_ROOT / "minerip.txt")
 
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     run_dir = (base_out_dir / ts).resolve()
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    results: List[RunResult] = []
-    try:
-        for diff in diffs:
-            for count in counts:
-                print(f"\n=== Running: COUNT={count}, DIFFICULTY={diff}, duration={args.duration}s ===")
-                res = run_experiment(
+    slots = max(1, args.parallel_slots)
+    slot_size = max(counts) if counts else 0
+    if slots > 1 and slots * slot_size > len(all_ips):
+        p.error(
+            f"--parallel-slots {slots} needs {slots * slot_size} IPs (slots x max(counts)) "
+            f"but minerip.txt has {len(all_ips)}"
+        )
+
+    experiment_kwargs = dict(
+        duration_sec=args.duration,
+        port=args.port,
+        warmup_sec=args.warmup,
+        ready_timeout_sec=args.ready_timeout,
+        poll_interval_sec=args.poll_interval,
+        progress_interval_sec=args.progress_interval,
+        progress_mode=args.progress_mode,
+        remote_dir=args.remote_dir,
+    )
+
+    # First Ctrl-C ends the current window(s) gracefully and skips the rest of the sweep;
+    # a second one interrupts immediately.
+    stop_event = threading.Event()
+
+    def on_sigint(signum, frame) -> None:
+        if stop_event.is_set():
+            kill_child_commands()
+            raise KeyboardInterrupt
+        stop_event.set()
+        print("\nStopping after the current measurement (Ctrl-C again to abort)...", flush=True)
+
+    prev_sigint = signal.signal(signal.SIGINT, on_sigint)
+
+    csv_path = run_dir / "results.csv"
+    ndjson_path = run_dir / "results.ndjson"
+    with csv_path.open("a", newline="", encoding="utf-8") as csv_f, ndjson_path.open("ab") as ndjson_f:
+        csv_writer = csv.writer(csv_f)
+        if csv_f.tell() == 0:
+            csv_writer.writerow(CSV_FIELDS)
+        record_lock = threading.Lock()
+
+        def record(res: RunResult) -> None:
+            with record_lock:
+                append_result(res, csv_writer=csv_writer, csv_f=csv_f, ndjson_f=ndjson_f)
+
+        try:
+            if slots > 1:
+                # Single-line progress output would interleave across workers.
+                experiment_kwargs["progress_interval_sec"] = 0.0
+                # Build once up front so concurrent deploys don't race on `go build`.
+                make_compile()
+                print(f"Running {len(diffs) * len(counts)} experiments on {slots} slots of {slot_size} miners")
+                run_parallel_sweep(
+                    [(diff, count) for diff in diffs for count in counts],
                     all_ips=all_ips,
-                    count=count,
-                    difficulty=diff,
-                    duration_sec=args.duration,
-                    port=args.port,
-                    warmup_sec=args.warmup,
-                    ready_timeout_sec=args.ready_timeout,
-                    poll_interval_sec=args.poll_interval,
-                    progress_interval_sec=args.progress_interval,
-                )
-                results.append(res)
-                print(
-                    f"Result: blocks_mined={res.blocks_mined} (chain_length {res.start_chain_length} -> {res.end_chain_length}), deploy_elapsed={res.deploy_elapsed_sec:.1f}s"
+                    slots=slots,
+                    slot_size=slot_size,
+                    stop_between=args.stop_between,
+                    on_result=record,
+                    stop_event=stop_event,
+                    **experiment_kwargs,
                 )
-                if args.stop_between:
-                    make_stop_miner()
-    finally:
-        # Always stop miners at the end.
-        make_stop_miner()
-
-    json_path, csv_path = write_outputs(results, run_dir, ts=ts)
+            else:
+                for diff, count in [(diff, count) for diff in diffs for count in counts]:
+                    if stop_event.is_set():
+                        break
+                    print(f"\n=== Running: COUNT={count}, DIFFICULTY={diff}, duration={args.duration}s ===")
+                    try:
+                        res = run_experiment(
+                            all_ips=all_ips,
+                            count=count,
+                            difficulty=diff,
+                            stop_event=stop_event,
+                            **experiment_kwargs,
+                        )
+                    except ExperimentAborted as e:
+                        # Ctrl-C during a window: keep the partial result and skip the rest.
+                        if e.result.duration_sec > 0:
+                            record(e.result)
+                            print(f"Interrupted: {describe_result(e.result)} over {e.result.duration_sec}s")
+                        break
+                    record(res)
+                    print(f"Result: {describe_result(res)}")
+                    if args.stop_between:
+                        make_stop_miner()
+        finally:
+            signal.signal(signal.SIGINT, prev_sigint)
+            # Always stop miners at the end.
+            make_stop_miner()
+            for addr in list(_RPC_CONNS):
+                _close_rpc(addr)
+
+    json_path, csv_path = write_outputs(run_dir)
 
     png_path = run_dir / "plot.png"
-    title = f"Blocks mined in {args.duration}s (log scale)\n(grouped by miner_count)"
-    plot_grouped_bars(
-        results,
-        out_path=png_path,
-        title=title,
-        counts=counts,
-        difficulties=diffs,
-    )
+    spawn_plot(run_dir, duration_sec=args.duration, counts=counts, diffs=diffs)
 
     print("\nOutputs")
     print(f"Dir:  {run_dir}")
     print(f"JSON: {json_path}")
     print(f"CSV:  {csv_path}")
-    print(f"PNG:  {png_path}")
+    print(f"PNG:  {png_path} (rendering in the background)")
 
     return 0
 
@@ -7,6 +7,7 @@ import (
 	"blockchain/pkg/config"
 	"blockchain/pkg/pow"
 	"blockchain/pkg/transaction"
+	"bufio"
 	"context"
 	"encoding/json"
 	"errors"
@@ -14,6 +15,7 @@ import (
 	"log"
 	"net"
 	"net/rpc"
+	"net/rpc/jsonrpc"
 	"sync"
 	"time"
 )
@@ -167,7 +169,7 @@ func (m *Miner) Start() error {
 				// Listener was closed
 				return
 			}
-			go m.rpcServer.ServeConn(conn)
+			go m.serveConn(conn)
 		}
 	}()
 
@@ -175,6 +177,35 @@ func (m *Miner) Start() error {
 	return nil
 }
 
+// bufferedConn is a net.Conn whose reads go through a bufio.Reader (used after peeking)
+type bufferedConn struct {
+	*bufio.Reader
+	net.Conn
+}
+
+func (c *bufferedConn) Read(p []byte) (int, error) {
+	return c.Reader.Read(p)
+}
+
+// serveConn serves one RPC connection. Connections that start with '{' use the
+// JSON-RPC codec (net/rpc/jsonrpc) so non-Go tools can query the miner on the same
+// port; everything else uses the default gob codec.
+func (m *Miner) serveConn(conn net.Conn) {
+	br := bufio.NewReader(conn)
+	first, err := br.Peek(1)
+	if err != nil {
+		conn.Close()
+		return
+	}
+
+	bc := &bufferedConn{Reader: br, Conn: conn}
+	if first[0] == '{' {
+		m.rpcServer.ServeCodec(jsonrpc.NewServerCodec(bc))
+		return
+	}
+	m.rpcServer.ServeConn(bc)
+}
+
 // Stop stops the miner
 func (m *Miner) Stop() {
 	m.stoppedMutex.Lock()
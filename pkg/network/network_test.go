@@ -4,7 +4,9 @@ import (
 	"blockchain/pkg/block"
 	"blockchain/pkg/transaction"
 	"fmt"
+	"net"
 	"net/rpc"
+	"net/rpc/jsonrpc"
 	"sync"
 	"testing"
 	"time"
@@ -32,6 +34,42 @@ func TestMinerStartStop(t *testing.T) {
 	miner.Stop()
 }
 
+func TestJSONRPCStatus(t *testing.T) {
+	miner := NewMiner("miner1", "localhost:19005", 2, nil)
+	if err := miner.Start(); err != nil {
+		t.Fatalf("Failed to start miner: %v", err)
+	}
+	defer miner.Stop()
+
+	conn, err := net.Dial("tcp", "localhost:19005")
+	if err != nil {
+		t.Fatalf("Failed to connect: %v", err)
+	}
+	client := jsonrpc.NewClient(conn)
+	defer client.Close()
+
+	// Several calls over the same connection
+	for i := 0; i < 3; i++ {
+		var reply StatusReply
+		if err := client.Call("RPCService.GetStatus", &struct{}{}, &reply); err != nil {
+			t.Fatalf("JSON-RPC GetStatus failed: %v", err)
+		}
+		if reply.ID != "miner1" || reply.ChainLength != 1 {
+			t.Errorf("Unexpected status: %+v", reply)
+		}
+	}
+
+	// The gob codec keeps working on the same port
+	gobClient := NewClient("test", nil)
+	status, err := gobClient.GetMinerStatus("localhost:19005")
+	if err != nil {
+		t.Fatalf("Gob GetStatus failed: %v", err)
+	}
+	if status.ID != "miner1" {
+		t.Errorf("Expected miner ID 'miner1', got '%s'", status.ID)
+	}
+}
+
 func TestSubmitTransaction(t *testing.T) {
 	// Generate ECDSA key pair for the miner
 	minerKP, err := transaction.GenerateKeyPair()